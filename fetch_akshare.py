@@ -1,26 +1,43 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import functools
+import hashlib
 import json
+import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime, time, timezone
 
 import pandas as pd
-import akshare as ak
+
+try:
+    import orjson  # Rust 实现的 JSON 编码器，比标准库快一个数量级
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """序列化为 UTF-8 JSON 字节串；装了 orjson 就用 orjson，否则退回标准库。"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+# 按精确类型分发，代替逐个 isinstance 走 MRO；这是 object 列的最内层循环
+_CONVERTERS = {
+    pd.Timestamp: lambda v: v.to_pydatetime().isoformat(),
+    datetime: datetime.isoformat,
+    time: time.isoformat,
+    date: date.isoformat,
+}
 
 
 def _convert_value(val):
     if val is pd.NaT:
         return None
-    if isinstance(val, pd.Timestamp):
-        return val.to_pydatetime().isoformat()
-    if isinstance(val, datetime):
-        return val.isoformat()
-    if isinstance(val, time):
-        return val.isoformat()
-    if isinstance(val, date):
-        return val.isoformat()
-    return val
+    fn = _CONVERTERS.get(type(val))
+    return fn(val) if fn is not None else val
 
 
 def safe_fetch(label: str, fn):
@@ -30,36 +47,100 @@ def safe_fetch(label: str, fn):
         if df is None:
             return {"名称": label, "状态": "空", "数据": []}
 
-        df = df.copy()
-        df = df.apply(lambda col: col.map(_convert_value))
+        # 输出最多保留 50 行，先裁剪再转换，免得白白转换用不到的行
+        df = df.head(50).copy()
+        # 按列 dtype 分发：datetime 列整列向量化格式化；只有 object 列
+        # （可能藏着 datetime.date/time）才走逐格的 _convert_value 慢路径
+        for c in df.columns:
+            s = df[c]
+            if pd.api.types.is_datetime64_any_dtype(s):
+                # 先转回 object，否则 str dtype 下 where 会把 None 强转成 nan
+                df[c] = (
+                    s.dt.strftime("%Y-%m-%dT%H:%M:%S")
+                    .astype(object)
+                    .where(s.notna(), None)
+                )
+            elif s.dtype == object:
+                df[c] = s.map(_convert_value)
 
         return {
             "名称": label,
             "状态": "正常",
-            "数据": df.to_dict(orient="records")[:50],
+            "数据": df.to_dict(orient="records"),
         }
     except Exception as e:
-        return {
+        result = {
             "名称": label,
             "状态": "异常",
             "错误": str(e),
-            "堆栈": traceback.format_exc(),
             "数据": [],
         }
+        # 完整堆栈动辄几十 KB 还要二次转义，只在调试时输出
+        if os.environ.get("DEBUG_TRACE"):
+            result["堆栈"] = traceback.format_exc()
+        return result
+
+
+@functools.lru_cache(maxsize=None)
+def _ak():
+    """akshare 导入要注册数百个接口、耗时数秒，推迟到真正用到时再加载。"""
+    import akshare
+
+    return akshare
+
+
+@functools.lru_cache(maxsize=None)
+def _has(attr: str) -> bool:
+    """hasattr 会触发 akshare 的惰性属性解析，结果在进程内缓存。"""
+    return hasattr(_ak(), attr)
 
 
 def fetch_if_exists(label: str, attr: str, *args, **kwargs):
     """检查 akshare 是否有该接口；没有则标记缺失。"""
-    if not hasattr(ak, attr):
+    if not _has(attr):
         return {"名称": label, "状态": "缺失", "数据": [], "错误": f"akshare 无 {attr}"}
-    return safe_fetch(label, lambda: getattr(ak, attr)(*args, **kwargs))
+    return safe_fetch(label, lambda: getattr(_ak(), attr)(*args, **kwargs))
+
+
+def _results_digest(results) -> str:
+    return hashlib.blake2b(_dumps(results), digest_size=16).hexdigest()
+
+
+def _previous_digest(path: str):
+    """取上次输出中数据部分的摘要；文件缺失或解析失败按无摘要处理。"""
+    try:
+        with open(path, "rb") as f:
+            previous = json.loads(f.read())
+        return _results_digest(previous["数据"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# 真正需要访问网络的接口；各自阻塞在不同站点的 I/O 上，因此并发抓取
+FETCH_TASKS = {
+    "财联社": ("财联社-全球快讯", "stock_info_global_cls"),
+    "东方财富个股热度榜": ("东方财富-个股热度榜", "stock_hot_rank_em"),
+    "央视新闻": ("央视新闻", "news_cctv"),
+    "财新要闻": ("财新要闻", "stock_news_main_cx"),
+}
 
 
 def main():
     print("Fetching AkShare A-share data...")
 
+    # 线程池并发抓取：总耗时约等于最慢的单个接口，而非各接口耗时之和。
+    # safe_fetch 已按任务捕获异常，单个接口失败不影响其余任务。
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=len(FETCH_TASKS)) as ex:
+        futures = {
+            ex.submit(fetch_if_exists, label, attr): key
+            for key, (label, attr) in FETCH_TASKS.items()
+        }
+        for fut in as_completed(futures):
+            fetched[futures[fut]] = fut.result()
+
     results = {
-        "财联社": fetch_if_exists("财联社-全球快讯", "stock_info_global_cls"),
+        "财联社": fetched["财联社"],
         # 东方财富新闻接口当前存在返回格式问题（JSONDecodeError），暂时标记为跳过
         "东方财富个股新闻": {
             "名称": "东方财富-个股新闻",
@@ -73,7 +154,7 @@ def main():
             "错误": "官方接口返回格式异常，已临时跳过",
             "数据": [],
         },
-        "东方财富个股热度榜": fetch_if_exists("东方财富-个股热度榜", "stock_hot_rank_em"),
+        "东方财富个股热度榜": fetched["东方财富个股热度榜"],
         # 概念热门接口在当前 AkShare 版本缺失
         "东方财富热门板块": {
             "名称": "东方财富-热门板块",
@@ -81,7 +162,7 @@ def main():
             "错误": "akshare 无 stock_board_concept_name 接口",
             "数据": [],
         },
-        "央视新闻": fetch_if_exists("央视新闻", "news_cctv"),
+        "央视新闻": fetched["央视新闻"],
         # 百度财经类接口在云端经常 403 取不到 Cookie，改为跳过
         "百度财经": {
             "名称": "百度财经",
@@ -95,16 +176,24 @@ def main():
             "错误": "云端获取百度 Cookie 403，已临时跳过",
             "数据": [],
         },
-        "财新要闻": fetch_if_exists("财新要闻", "stock_news_main_cx"),
+        "财新要闻": fetched["财新要闻"],
     }
 
+    # 数据没变就不重写，免得只有更新时间在动、白白触发 git 提交与缓存失效
+    if _results_digest(results) == _previous_digest("akshare.json"):
+        print("akshare.json unchanged, skip write")
+        return
+
     output = {
         "更新时间": datetime.now(timezone.utc).isoformat(),
         "数据": results,
     }
 
-    with open("akshare.json", "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    # 先写临时文件再原子替换，脚本中途被杀也不会留下半截 JSON
+    tmp = "akshare.json.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_dumps(output))
+    os.replace(tmp, "akshare.json")
 
     print("Saved to akshare.json")
 